@@ -0,0 +1,17 @@
+"""Gunicorn configuration for the web interface
+
+One gevent worker multiplexes many concurrent /status pollers and
+long-lived /events streams cooperatively instead of serializing behind
+Werkzeug's dev server. Status state, the SSE subscriber queues, the
+in-progress guards and the NAS client pool all live in module globals,
+so a single process is required for broadcasts to reach every connected
+browser; 1000 greenlet connections is ample for this dashboard.
+"""
+
+import os
+
+bind = f"{os.environ.get('WEB_HOST', '0.0.0.0')}:{os.environ.get('WEB_PORT', '8080')}"
+worker_class = 'gevent'
+workers = 1
+worker_connections = 1000
+keepalive = 5
@@ -8,114 +8,369 @@ import os
 import sys
 import json
 import time
+import random
 import logging
-import argparse
-import subprocess
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Optional, Dict, Any
-import requests
-from requests.packages.urllib3.exceptions import InsecureRequestWarning
 
-# Disable SSL warnings for self-signed certificates
-requests.packages.urllib3.disable_warnings(InsecureRequestWarning)
+# Prefer orjson for parsing DSM responses (2-5x faster than stdlib json on
+# the Docker project list payloads); fall back to stdlib when not installed
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+# requests (and the urllib3/ssl machinery it drags in) is imported lazily on
+# first client construction so invocations that never hit the network - like
+# --help - don't pay for it at startup
+requests = None
+HTTPAdapter = None
+
+
+def _import_requests():
+    """Import requests on first use and disable self-signed cert warnings"""
+    global requests, HTTPAdapter
+    if requests is None:
+        import requests as _requests
+        from requests.adapters import HTTPAdapter as _HTTPAdapter
+        from requests.packages.urllib3.exceptions import InsecureRequestWarning
+
+        # Disable SSL warnings for self-signed certificates
+        _requests.packages.urllib3.disable_warnings(InsecureRequestWarning)
+        requests = _requests
+        HTTPAdapter = _HTTPAdapter
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Docker Compose projects managed by --start-projects / --stop-projects
+PREDEFINED_PROJECTS = ('iot', 'jellyfin', 'arr-project', 'watchtower')
+
+
+def build_session():
+    """Build a requests.Session configured for talking to DSM
+
+    Factored out of SynologyShutdown.__init__ so callers constructing
+    several clients (e.g. the web app) can build one session and share it
+    across all of them via the session= kwarg, reusing the same keep-alive
+    connection pool.
+    """
+    _import_requests()
+    session = requests.Session()
+    session.verify = False
+    # Talking straight to a LAN NAS - skip the per-request proxy and
+    # netrc environment lookups
+    session.trust_env = False
+    # gzip on responses (urllib3 decodes transparently) cuts the large
+    # Docker project list payloads down to a fraction on the wire
+    session.headers.update({'Accept-Encoding': 'gzip, deflate',
+                            'Connection': 'keep-alive'})
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=20)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+@functools.lru_cache(maxsize=64)
+def _quoted_id(project_id: str) -> str:
+    """Wrap a project ID in the double quotes the Docker Project API expects
+
+    requests urlencodes the quotes to %22 on the wire. Memoized and kept in
+    one place so the API quirk has a single source of truth.
+    """
+    return f'"{project_id}"'
+
+
+class CircuitBreaker:
+    """Per-host circuit breaker for DSM calls
+
+    After failure_threshold consecutive failed requests the breaker opens
+    and further calls are skipped outright; once recovery_s has elapsed a
+    single probe request is let through and the breaker closes again on
+    success. Keeps worst-case failure latency bounded no matter how many
+    fallback endpoints and retries sit above it.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = 5, recovery_s: float = 10.0):
+        self.failure_threshold = failure_threshold
+        self.recovery_s = recovery_s
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a request may be attempted right now"""
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < self.recovery_s:
+                    return False
+                self.state = self.HALF_OPEN
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.state = self.CLOSED
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
 
 class SynologyShutdown:
-    def __init__(self, host: str, username: str, password: str, port: int = 5000, use_https: bool = True):
+    _CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'synodown')
+    _ENDPOINT_CACHE_FILE = os.path.join(_CACHE_DIR, 'endpoints.json')
+
+    # Candidate shutdown endpoints - only one exists on any DSM version
+    _KNOWN_SHUTDOWN_ENDPOINTS = (
+        ('entry.cgi', 'SYNO.Core.System', 'shutdown'),
+        ('entry.cgi', 'SYNO.Core.System.Utilization', 'shutdown'),
+        ('entry.cgi', 'SYNO.DSM.System', 'shutdown'),
+    )
+
+    # One breaker per NAS host, shared by all instances talking to it
+    _breakers: Dict[str, CircuitBreaker] = {}
+
+    def __init__(self, host: str, username: str, password: str, port: int = 5000, use_https: bool = True,
+                 session=None):
+        _import_requests()
         self.host = host
         self.username = username
         self.password = password
         self.port = port
         self.use_https = use_https
         self.session_id = None
+        # Connecting to a LAN NAS should take well under a second; a dead
+        # host should fail in ~2s rather than stalling a full read timeout
+        self.connect_timeout = 2.0
+        self.read_timeout = 30.0
         self.base_url = f"{'https' if use_https else 'http'}://{host}:{port}"
-        
+        self._webapi_base = f"{self.base_url}/webapi"
+        self._auth_url = f"{self._webapi_base}/auth.cgi"
+        self._entry_url = f"{self._webapi_base}/entry.cgi"
+        self._projects_cache = None
+        self._projects_cache_ts = 0.0
+        self._projects_cache_ttl = 5.0
+        self._projects_lock = threading.Lock()
+        self._projects_by_name = {}
+        self._shutdown_endpoint_cache = None
+        self._breaker = self._breakers.setdefault(host, CircuitBreaker())
+        self._ssh = None
+
+        # Reuse one HTTP session so every API call shares the same
+        # keep-alive TCP/TLS connection instead of re-handshaking. A
+        # caller-supplied session is shared with other instances, so
+        # close() leaves it open for them.
+        self._owns_session = session is None
+        self.session = session if session is not None else build_session()
+
+        # Pre-bound helper for the hot Docker Project calls so the static
+        # endpoint/api parts are baked in once instead of rebuilt per call
+        self._docker_project_req = functools.partial(
+            self._make_request_with_endpoint, 'entry.cgi', 'SYNO.Docker.Project')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Close the underlying HTTP session and any open SSH connection"""
+        if self._owns_session:
+            self.session.close()
+        if self._ssh is not None:
+            self._ssh.close()
+            self._ssh = None
+
+    # HTTP statuses worth retrying: throttling and transient server errors
+    _RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+    def _send(self, url: str, params: Dict[str, Any], use_post: bool, timeout: float):
+        """Issue one HTTP request to DSM and return the raw response"""
+        # Split connect/read phases so a dead host fails fast while slow
+        # responses still get the full read budget
+        timeouts = (self.connect_timeout, timeout)
+        if use_post:
+            return self.session.post(url, data=params, timeout=timeouts)
+        return self.session.get(url, params=params, timeout=timeouts)
+
+    def _request(self, url: str, params: Dict[str, Any], use_post: bool = False, timeout: Optional[float] = None,
+                 max_attempts: int = 4, base_delay: float = 0.25, max_delay: float = 4.0) -> Optional[Dict]:
+        """Send a request to Synology DSM and decode the JSON response
+
+        Transient failures (connect errors, timeouts, 429/5xx) are retried
+        with exponential backoff and full jitter. Anything else - including
+        DSM auth errors, which arrive as success=False payloads - fails
+        immediately.
+        """
+        if not self._breaker.allow():
+            logger.warning(f"Circuit breaker open for {self.host}, skipping request")
+            return None
+
+        if timeout is None:
+            timeout = self.read_timeout
+        api = params.get('api')
+        error = None
+        for attempt in range(max_attempts):
+            try:
+                response = self._send(url, params, use_post, timeout)
+                response.raise_for_status()
+                self._breaker.record_success()
+
+                # Handle special case for start_stream which may return non-JSON
+                if api == 'SYNO.Docker.Project' and params.get('method') == 'start_stream':
+                    # start_stream may return plain text, not JSON
+                    try:
+                        return _loads(response.content)
+                    except ValueError:
+                        # start_stream returned non-JSON (likely plain text logs)
+                        # This is actually normal and means the operation may have succeeded
+                        logger.info(f"start_stream returned non-JSON response (this is normal): {response.text[:100]}")
+                        return None  # Will be handled by the status check logic
+
+                # Decode from the raw bytes - skips requests' charset sniffing
+                return _loads(response.content)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+            except requests.HTTPError as e:
+                if e.response is not None and e.response.status_code in self._RETRYABLE_STATUSES:
+                    error = e
+                else:
+                    self._breaker.record_failure()
+                    logger.error(f"API request failed: {e}")
+                    return None
+            except requests.RequestException as e:
+                self._breaker.record_failure()
+                logger.error(f"API request failed: {e}")
+                return None
+
+            if attempt < max_attempts - 1:
+                delay = random.uniform(0, min(max_delay, base_delay * 2 ** attempt))
+                logger.warning(f"API request failed ({error}), retrying in {delay:.2f}s")
+                time.sleep(delay)
+
+        self._breaker.record_failure()
+        logger.error(f"API request failed after {max_attempts} attempts: {error}")
+        return None
+
     def _make_request(self, api: str, method: str, params: Dict[str, Any]) -> Optional[Dict]:
         """Make API request to Synology DSM"""
         if api == 'SYNO.API.Auth':
-            url = f"{self.base_url}/webapi/auth.cgi"
+            url = self._auth_url
         else:
-            url = f"{self.base_url}/webapi/{api}"
-        params.update({
+            url = f"{self._webapi_base}/{api}"
+        # Merge into a fresh dict so the caller's params are not mutated
+        params = {
+            **params,
             'api': api,
             'method': method,
             'version': 3 if api == 'SYNO.API.Auth' else 1
-        })
-        
-        try:
-            response = requests.get(url, params=params, verify=False, timeout=30)
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
-            logger.error(f"API request failed: {e}")
-            return None
-    
-    def _make_request_with_endpoint(self, endpoint: str, api: str, method: str, params: Dict[str, Any], use_post: bool = False) -> Optional[Dict]:
+        }
+        # Auth calls go as POSTs so credentials travel in the form body
+        # rather than the query string, where proxies tend to log them
+        return self._request(url, params, use_post=url == self._auth_url)
+
+    def _make_request_with_endpoint(self, endpoint: str, api: str, method: str, params: Dict[str, Any], use_post: bool = False, timeout: Optional[float] = None) -> Optional[Dict]:
         """Make API request to Synology DSM with specific endpoint"""
-        url = f"{self.base_url}/webapi/{endpoint}"
-        params.update({
+        url = self._entry_url if endpoint == 'entry.cgi' else f"{self._webapi_base}/{endpoint}"
+        # Merge into a fresh dict so the caller's params are not mutated
+        params = {
+            **params,
             'api': api,
             'method': method,
             'version': 1
-        })
-        
-        try:
-            if use_post:
-                # Handle special case for Docker Project API with quoted IDs
-                if api == 'SYNO.Docker.Project' and any('id' in key for key in params.keys()):
-                    # Build the data string manually to avoid double URL encoding
-                    data_parts = []
-                    for key, value in params.items():
-                        if key == 'id' and value.startswith('%22'):
-                            # Don't encode the pre-encoded ID
-                            data_parts.append(f"{key}={value}")
-                        else:
-                            data_parts.append(f"{key}={value}")
-                    data_string = "&".join(data_parts)
-                    response = requests.post(url, data=data_string, 
-                                           headers={'Content-Type': 'application/x-www-form-urlencoded'},
-                                           verify=False, timeout=30)
-                else:
-                    response = requests.post(url, data=params, verify=False, timeout=30)
-            else:
-                response = requests.get(url, params=params, verify=False, timeout=30)
-            response.raise_for_status()
-            
-            # Handle special case for start_stream which may return non-JSON
-            if api == 'SYNO.Docker.Project' and method == 'start_stream':
-                # start_stream may return plain text, not JSON
-                try:
-                    return response.json()
-                except (ValueError, requests.exceptions.JSONDecodeError):
-                    # start_stream returned non-JSON (likely plain text logs)
-                    # This is actually normal and means the operation may have succeeded
-                    logger.info(f"start_stream returned non-JSON response (this is normal): {response.text[:100]}")
-                    return None  # Will be handled by the status check logic
-            else:
-                return response.json()
-        except requests.RequestException as e:
-            logger.error(f"API request failed: {e}")
-            return None
+        }
+        return self._request(url, params, use_post=use_post, timeout=timeout)
     
+    def _read_cache_file(self) -> Dict:
+        """Read the on-disk discovery cache (missing/corrupt reads as empty)"""
+        try:
+            with open(self._ENDPOINT_CACHE_FILE, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_cache_key(self, key: str, value):
+        """Persist one discovery result to the on-disk cache"""
+        try:
+            cache = self._read_cache_file()
+            cache[key] = value
+            os.makedirs(self._CACHE_DIR, exist_ok=True)
+            with open(self._ENDPOINT_CACHE_FILE, 'w') as f:
+                json.dump(cache, f)
+        except OSError as e:
+            logger.debug(f"Could not persist endpoint cache: {e}")
+
+    def _load_endpoint_cache(self) -> Optional[list]:
+        """Load the shutdown endpoint that worked last time for this host"""
+        return self._read_cache_file().get(f"{self.host}:{self.port}")
+
+    def _save_endpoint_cache(self, endpoint: str, api: str, method: str):
+        """Persist the working shutdown endpoint so later runs try it first"""
+        self._write_cache_key(f"{self.host}:{self.port}", [endpoint, api, method])
+
+    # DSM error codes that mean a session id is no longer usable
+    _SESSION_EXPIRED_CODES = frozenset({105, 106, 107, 119})
+
+    def _sid_cache_key(self) -> str:
+        return f"{self.host}:{self.port}:sid"
+
+    def _validate_session(self, sid: str) -> bool:
+        """Cheaply check whether a DSM session id is still accepted"""
+        result = self._make_request_with_endpoint(
+            'entry.cgi', 'SYNO.API.Info', 'query',
+            {'_sid': sid, 'query': 'SYNO.API.Auth'}, timeout=2)
+        if not result:
+            return False
+        if result.get('success'):
+            return True
+        return result.get('error', {}).get('code') not in self._SESSION_EXPIRED_CODES
+
     def login(self) -> bool:
-        """Authenticate with Synology DSM"""
+        """Authenticate with Synology DSM, reusing a still-valid session"""
+        # A sid already held in this process skips the login round trip
+        # after a cheap validation call
+        if self.session_id:
+            if self._validate_session(self.session_id):
+                return True
+            self.session_id = None
+
+        # A sid persisted by a previous invocation may still be within the
+        # DSM session TTL - repeated CLI runs then skip login entirely
+        cached_sid = self._read_cache_file().get(self._sid_cache_key())
+        if cached_sid and self._validate_session(cached_sid):
+            logger.info("Reusing persisted DSM session")
+            self.session_id = cached_sid
+            return True
+
         logger.info("Attempting to login to Synology DSM...")
-        
+
         params = {
             'account': self.username,
             'passwd': self.password,
             'session': 'DSM',
             'format': 'sid'
         }
-        
+
         result = self._make_request('SYNO.API.Auth', 'login', params)
         if result and result.get('success'):
             self.session_id = result.get('data', {}).get('sid')
             logger.info("Successfully logged in to Synology DSM")
+            self._write_cache_key(self._sid_cache_key(), self.session_id)
             return True
-        
+
         logger.error("Failed to login to Synology DSM")
         return False
     
@@ -131,46 +386,97 @@ class SynologyShutdown:
             '_sid': self.session_id
         }
         
-        # Try different API endpoints for shutdown
-        api_endpoints = [
-            ('entry.cgi', 'SYNO.Core.System', 'shutdown'),
-            ('entry.cgi', 'SYNO.Core.System.Utilization', 'shutdown'),
-            ('entry.cgi', 'SYNO.DSM.System', 'shutdown')
-        ]
-        
-        for endpoint, api, method in api_endpoints:
+        # Try the endpoint that worked before first - in-memory within this
+        # process, persisted across runs - so the steady state is exactly
+        # one request instead of a probe
+        cached = self._shutdown_endpoint_cache or self._load_endpoint_cache()
+        if cached:
+            endpoint, api, method = cached
             result = self._make_request_with_endpoint(endpoint, api, method, params)
             if result and result.get('success'):
                 logger.info("Shutdown command sent successfully via API")
+                self._shutdown_endpoint_cache = (endpoint, api, method)
                 return True
-            elif result:
-                logger.warning(f"API {api} failed: {result}")
-        
+            self._shutdown_endpoint_cache = None
+            logger.warning(f"Cached shutdown endpoint {api} no longer works, re-probing")
+
+        # Only one of these endpoints exists on any given DSM version, so
+        # probe them concurrently instead of waiting out the failures in
+        # series - total time is bounded by the slowest single request.
+        # Probes use a short timeout: the NAS accepts or rejects a
+        # shutdown command quickly, a dead endpoint should not burn 30s.
+        success = False
+        with ThreadPoolExecutor(max_workers=len(self._KNOWN_SHUTDOWN_ENDPOINTS)) as executor:
+            futures = {
+                executor.submit(self._make_request_with_endpoint, endpoint, api, method, params, timeout=5): (endpoint, api, method)
+                for endpoint, api, method in self._KNOWN_SHUTDOWN_ENDPOINTS
+            }
+            for future in as_completed(futures):
+                endpoint, api, method = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.warning(f"API {api} failed: {e}")
+                    continue
+                if result and result.get('success'):
+                    logger.info("Shutdown command sent successfully via API")
+                    self._shutdown_endpoint_cache = (endpoint, api, method)
+                    self._save_endpoint_cache(endpoint, api, method)
+                    success = True
+                elif result:
+                    logger.warning(f"API {api} failed: {result}")
+
+        if success:
+            return True
+
         logger.error("All API shutdown methods failed")
         return False
     
-    def get_projects(self) -> Optional[Dict]:
-        """Get list of Docker Compose projects"""
+    def get_projects(self, force_refresh: bool = False) -> Optional[Dict]:
+        """Get list of Docker Compose projects (cached for the session lifetime)"""
         if not self.session_id:
             logger.error("Not logged in")
             return None
-        
-        logger.info("Getting list of Docker Compose projects...")
-        
-        params = {
-            '_sid': self.session_id
-        }
-        
-        result = self._make_request_with_endpoint('entry.cgi', 'SYNO.Docker.Project', 'list', params)
-        if result and result.get('success'):
-            data = result.get('data', {})
-            # Projects are returned as a dictionary with project IDs as keys
-            projects = list(data.values()) if isinstance(data, dict) else []
-            logger.info(f"Found {len(projects)} projects")
-            return {'projects': projects}
-        
+
+        # Serialize cache fills so a concurrent fan-out (the thread-pooled
+        # project batch) results in one real list request, not one per worker
+        with self._projects_lock:
+            if (self._projects_cache is not None and not force_refresh
+                    and time.monotonic() - self._projects_cache_ts < self._projects_cache_ttl):
+                return self._projects_cache
+
+            logger.info("Getting list of Docker Compose projects...")
+
+            params = {
+                '_sid': self.session_id
+            }
+
+            result = self._docker_project_req('list', params)
+            if result and result.get('success'):
+                data = result.get('data', {})
+                # Projects are returned as a dictionary with project IDs as keys
+                projects = list(data.values()) if isinstance(data, dict) else []
+                logger.info(f"Found {len(projects)} projects")
+                by_name = {p.get('name'): p for p in projects if p.get('name')}
+                by_id = {p.get('id'): p for p in projects if p.get('id')}
+                self._projects_cache = {'projects': projects, 'by_name': by_name, 'by_id': by_id}
+                self._projects_cache_ts = time.monotonic()
+                self._projects_by_name = by_name
+                return self._projects_cache
+
         logger.error("Failed to get project list")
         return None
+
+    def invalidate_projects_cache(self):
+        """Drop the cached project list so the next call hits the NAS"""
+        with self._projects_lock:
+            self._projects_cache = None
+            self._projects_cache_ts = 0.0
+
+    def refresh_projects(self) -> Optional[Dict]:
+        """Invalidate the projects cache and fetch a fresh list"""
+        self.invalidate_projects_cache()
+        return self.get_projects(force_refresh=True)
     
     def start_project(self, project_name: str = None, project_id: str = None) -> bool:
         """Start a Docker Compose project by name or ID"""
@@ -184,16 +490,12 @@ class SynologyShutdown:
         
         # If project_name is provided, find the project_id
         if project_name and not project_id:
-            projects_data = self.get_projects()
-            if not projects_data:
+            if not self.get_projects():
                 return False
-            
-            projects = projects_data.get('projects', [])
-            for project in projects:
-                if project.get('name') == project_name:
-                    project_id = project.get('id')
-                    break
-            
+
+            project = self._projects_by_name.get(project_name)
+            project_id = project.get('id') if project else None
+
             if not project_id:
                 logger.error(f"Project {project_name} not found")
                 return False
@@ -206,48 +508,38 @@ class SynologyShutdown:
         }
         
         # Check if project is already running
-        projects_data = self.get_projects()
-        if projects_data:
-            projects = projects_data.get('projects', [])
-            for project in projects:
-                if project.get('name') == project_name:
-                    current_status = project.get('status', 'unknown')
-                    if current_status == 'RUNNING':
-                        logger.info(f"Project {project_name} is already running")
-                        return True
-                    logger.info(f"Current status of {project_name}: {current_status}")
-                    break
-        
-        # Use the exact format from the user's hint
-        # api=SYNO.Docker.Project&method=start_stream&version=1&id=%225730670e-be4a-4f00-84b3-22a3b473a4e8%22
-        import urllib.parse
-        quoted_id = f'%22{project_id}%22'  # URL-encoded quotes around the ID
-        
+        if project_name and self.get_projects():
+            project = self._projects_by_name.get(project_name)
+            if project:
+                current_status = project.get('status', 'unknown')
+                if current_status == 'RUNNING':
+                    logger.info(f"Project {project_name} is already running")
+                    return True
+                logger.info(f"Current status of {project_name}: {current_status}")
+        
+        quoted_id = _quoted_id(project_id)
+
         logger.info(f"Trying start_stream method with quoted ID format for project {project_name or project_id}")
-        
-        # Use start_stream with properly formatted ID (user's exact format)
+
         stream_params = {
             '_sid': self.session_id,
             'id': quoted_id
         }
         
-        result = self._make_request_with_endpoint('entry.cgi', 'SYNO.Docker.Project', 'start_stream', stream_params, use_post=True)
-        
+        # The project state is about to change, so the cached list is stale
+        self.invalidate_projects_cache()
+        result = self._docker_project_req('start_stream', stream_params, use_post=True)
+
         # start_stream may return different response format or no JSON response
         if result is None:
             # start_stream might not return JSON, check if project started by re-querying
             import time
             time.sleep(3)  # Give it more time to start
-            projects_data = self.get_projects()
-            if projects_data:
-                projects = projects_data.get('projects', [])
-                for project in projects:
-                    if project.get('name') == project_name:
-                        new_status = project.get('status', 'unknown')
-                        if new_status == 'RUNNING':
-                            logger.info(f"Project {project_name} started successfully using start_stream (verified by status check)")
-                            return True
-                        break
+            if self.get_projects(force_refresh=True):
+                project = self._projects_by_name.get(project_name)
+                if project and project.get('status', 'unknown') == 'RUNNING':
+                    logger.info(f"Project {project_name} started successfully using start_stream (verified by status check)")
+                    return True
         elif result and result.get('success'):
             logger.info(f"Project {project_name or project_id} started successfully using start_stream")
             return True
@@ -256,7 +548,7 @@ class SynologyShutdown:
             logger.warning(f"start_stream failed with error code {error_code}: {result}")
         
         logger.info(f"start_stream did not work, trying regular start method for project {project_name or project_id}")
-        result = self._make_request_with_endpoint('entry.cgi', 'SYNO.Docker.Project', 'start', params, use_post=True)
+        result = self._docker_project_req('start', params, use_post=True)
         if result and result.get('success'):
             logger.info(f"Project {project_name or project_id} started successfully using regular start")
             return True
@@ -276,16 +568,12 @@ class SynologyShutdown:
         
         # If project_name is provided, find the project_id
         if project_name and not project_id:
-            projects_data = self.get_projects()
-            if not projects_data:
+            if not self.get_projects():
                 return False
-            
-            projects = projects_data.get('projects', [])
-            for project in projects:
-                if project.get('name') == project_name:
-                    project_id = project.get('id')
-                    break
-            
+
+            project = self._projects_by_name.get(project_name)
+            project_id = project.get('id') if project else None
+
             if not project_id:
                 logger.error(f"Project {project_name} not found")
                 return False
@@ -298,30 +586,27 @@ class SynologyShutdown:
         }
         
         # Check if project is already stopped
-        projects_data = self.get_projects()
-        if projects_data:
-            projects = projects_data.get('projects', [])
-            for project in projects:
-                if project.get('name') == project_name:
-                    current_status = project.get('status', 'unknown')
-                    if current_status == 'STOPPED':
-                        logger.info(f"Project {project_name} is already stopped")
-                        return True
-                    logger.info(f"Current status of {project_name}: {current_status}")
-                    break
-        
-        # Use the same quoted ID format as start_stream for consistency
-        quoted_id = f'%22{project_id}%22'  # URL-encoded quotes around the ID
-        
+        if project_name and self.get_projects():
+            project = self._projects_by_name.get(project_name)
+            if project:
+                current_status = project.get('status', 'unknown')
+                if current_status == 'STOPPED':
+                    logger.info(f"Project {project_name} is already stopped")
+                    return True
+                logger.info(f"Current status of {project_name}: {current_status}")
+        
+        quoted_id = _quoted_id(project_id)
+
         logger.info(f"Trying stop method with quoted ID format for project {project_name or project_id}")
-        
-        # Use stop with properly formatted ID (same format as start_stream)
+
         quoted_params = {
             '_sid': self.session_id,
             'id': quoted_id
         }
         
-        result = self._make_request_with_endpoint('entry.cgi', 'SYNO.Docker.Project', 'stop', quoted_params, use_post=True)
+        # The project state is about to change, so the cached list is stale
+        self.invalidate_projects_cache()
+        result = self._docker_project_req('stop', quoted_params, use_post=True)
         if result and result.get('success'):
             logger.info(f"Project {project_name or project_id} stopped successfully using quoted ID format")
             return True
@@ -330,7 +615,7 @@ class SynologyShutdown:
         
         # Fallback to regular stop method
         logger.info(f"Trying fallback stop method for project {project_name or project_id}")
-        result = self._make_request_with_endpoint('entry.cgi', 'SYNO.Docker.Project', 'stop', params, use_post=True)
+        result = self._docker_project_req('stop', params, use_post=True)
         if result and result.get('success'):
             logger.info(f"Project {project_name or project_id} stopped successfully using regular method")
             return True
@@ -340,71 +625,154 @@ class SynologyShutdown:
         logger.error(f"Failed to stop project {project_name or project_id} with all methods")
         return False
     
-    def get_project_status(self, project_name: str) -> Optional[str]:
+    def get_project_status(self, project_name: str, force_refresh: bool = False) -> Optional[str]:
         """Get status of a specific Docker Compose project"""
-        projects_data = self.get_projects()
-        if not projects_data:
+        if not self.get_projects(force_refresh=force_refresh):
             return None
-        
-        projects = projects_data.get('projects', [])
-        for project in projects:
-            if project.get('name') == project_name:
-                return project.get('status', 'unknown')
-        
+
+        project = self._projects_by_name.get(project_name)
+        if project:
+            return project.get('status', 'unknown')
+
         logger.warning(f"Project {project_name} not found")
         return None
+
+    def get_project_info(self, project_id: str) -> Optional[Dict]:
+        """Get a single Docker Compose project by ID without fetching the full list
+
+        Cheaper than get_projects() when polling one project repeatedly.
+        """
+        if not self.session_id:
+            logger.error("Not logged in")
+            return None
+
+        params = {
+            '_sid': self.session_id,
+            'id': project_id
+        }
+
+        result = self._docker_project_req('get', params)
+        if result and result.get('success'):
+            return result.get('data')
+
+        logger.error(f"Failed to get project {project_id}")
+        return None
     
+    def _batch_project_action(self, action: str, project_ids: Dict[str, str]) -> Optional[Dict[str, bool]]:
+        """Try to start/stop several projects with a single multi-id request
+
+        Some DSM builds accept a CSV of quoted IDs in one call. The
+        discovery result is persisted per host so later runs either batch
+        straight away or skip the probe. Returns per-project results on
+        success, None when unsupported (caller falls back to per-project
+        requests over the shared keep-alive connection).
+        """
+        multi_key = f"{self.host}:{self.port}:multi_id"
+        supported = self._read_cache_file().get(multi_key)
+        if supported is False or len(project_ids) < 2:
+            return None
+
+        method = 'start_stream' if action == 'start' else 'stop'
+        params = {
+            '_sid': self.session_id,
+            'id': ','.join(_quoted_id(pid) for pid in project_ids.values())
+        }
+
+        self.invalidate_projects_cache()
+        result = self._docker_project_req(method, params, use_post=True)
+        if result and result.get('success'):
+            if supported is None:
+                self._write_cache_key(multi_key, True)
+            logger.info(f"Batched {action} of {len(project_ids)} projects in one request")
+            return {name: True for name in project_ids}
+
+        # Only an explicit failure payload proves the API rejected the CSV
+        # form; a None result (breaker open, non-JSON stream) stays unknown,
+        # and a session-expired error is transient rather than a verdict on
+        # batching, so neither may poison the per-host cache
+        if result and supported is None:
+            error_code = result.get('error', {}).get('code')
+            if error_code not in self._SESSION_EXPIRED_CODES:
+                self._write_cache_key(multi_key, False)
+        return None
+
     def manage_predefined_projects(self, action: str) -> Dict[str, bool]:
         """Start or stop predefined projects: iot, jellyfin, arr-project, watchtower"""
-        predefined_projects = ['iot', 'jellyfin', 'arr-project', 'watchtower']
         results = {}
-        
+
         if action not in ['start', 'stop']:
             logger.error("Action must be 'start' or 'stop'")
             return results
-        
-        for project_name in predefined_projects:
-            try:
-                if action == 'start':
-                    success = self.start_project(project_name=project_name)
-                else:
-                    success = self.stop_project(project_name=project_name)
-                
-                results[project_name] = success
-            except Exception as e:
-                logger.error(f"Error {action}ing project {project_name}: {e}")
-                results[project_name] = False
-        
+
+        # Resolve all project names to IDs with a single list request, then
+        # run the start/stop calls concurrently - they are independent and
+        # each just waits on NAS HTTP latency
+        projects_data = self.get_projects()
+        if not projects_data:
+            return {name: False for name in PREDEFINED_PROJECTS}
+
+        by_name = projects_data.get('by_name', {})
+        project_ids = {
+            name: by_name[name].get('id')
+            for name in PREDEFINED_PROJECTS if name in by_name
+        }
+
+        # One multi-id round trip when the DSM build supports it
+        batch = self._batch_project_action(action, project_ids)
+        if batch is not None:
+            for name in PREDEFINED_PROJECTS:
+                batch.setdefault(name, False)
+            return batch
+
+        do_action = self.start_project if action == 'start' else self.stop_project
+
+        with ThreadPoolExecutor(max_workers=len(PREDEFINED_PROJECTS)) as executor:
+            futures = {
+                executor.submit(do_action, project_name=name, project_id=project_ids.get(name)): name
+                for name in PREDEFINED_PROJECTS
+            }
+            for future in as_completed(futures):
+                project_name = futures[future]
+                try:
+                    results[project_name] = future.result()
+                except Exception as e:
+                    logger.error(f"Error {action}ing project {project_name}: {e}")
+                    results[project_name] = False
+
         return results
     
+    def _ssh_client(self, ssh_port: int = 22):
+        """Get an in-process paramiko SSH connection, reusing an open one"""
+        import paramiko
+
+        if self._ssh is not None:
+            transport = self._ssh.get_transport()
+            if transport is not None and transport.is_active():
+                return self._ssh
+
+        client = paramiko.SSHClient()
+        client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        client.connect(self.host, port=ssh_port, username=self.username,
+                       password=self.password, timeout=10, banner_timeout=10)
+        self._ssh = client
+        return client
+
     def shutdown_via_ssh(self, ssh_port: int = 22) -> bool:
         """Attempt shutdown via SSH (requires SSH enabled on NAS)"""
         logger.info("Attempting shutdown via SSH...")
-        
+
         try:
-            cmd = [
-                'sshpass', '-p', self.password,
-                'ssh', '-o', 'StrictHostKeyChecking=no',
-                '-p', str(ssh_port),
-                f'{self.username}@{self.host}',
-                'sudo shutdown -h now'
-            ]
-            
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-            
-            if result.returncode == 0:
+            client = self._ssh_client(ssh_port)
+            stdin, stdout, stderr = client.exec_command('sudo shutdown -h now', timeout=30)
+            exit_status = stdout.channel.recv_exit_status()
+
+            if exit_status == 0:
                 logger.info("Shutdown command sent successfully via SSH")
                 return True
-            else:
-                logger.error(f"SSH shutdown failed: {result.stderr}")
-                return False
-                
-        except subprocess.TimeoutExpired:
-            logger.error("SSH shutdown timed out")
-            return False
-        except FileNotFoundError:
-            logger.error("sshpass not found. SSH method requires sshpass to be installed.")
+
+            logger.error(f"SSH shutdown failed: {stderr.read().decode('utf-8', errors='replace')}")
             return False
+
         except Exception as e:
             logger.error(f"SSH shutdown failed: {e}")
             return False
@@ -414,7 +782,10 @@ class SynologyShutdown:
         if self.session_id:
             params = {'_sid': self.session_id}
             self._make_request('auth.cgi', 'logout', params)
+            # The sid is dead now - don't let a later run try to reuse it
+            self._write_cache_key(self._sid_cache_key(), None)
             logger.info("Logged out from Synology DSM")
+        self.close()
     
     def shutdown(self, use_ssh: bool = False, ssh_port: int = 22) -> bool:
         """Main shutdown method"""
@@ -424,20 +795,22 @@ class SynologyShutdown:
             if self.login():
                 if not use_ssh:
                     success = self.shutdown_via_api()
-                
+
                 if not success and use_ssh:
                     success = self.shutdown_via_ssh(ssh_port)
-                
+
                 self.logout()
-            
+
             return success
-        
+
         except KeyboardInterrupt:
             logger.info("Shutdown cancelled by user")
             return False
         except Exception as e:
             logger.error(f"Unexpected error during shutdown: {e}")
             return False
+        finally:
+            self.close()
 
 
 def load_config() -> Dict[str, Any]:
@@ -448,8 +821,8 @@ def load_config() -> Dict[str, Any]:
     config_file = os.environ.get('CONFIG_FILE', '/app/config.json')
     if os.path.exists(config_file):
         try:
-            with open(config_file, 'r') as f:
-                config = json.load(f)
+            with open(config_file, 'rb') as f:
+                config = _loads(f.read())
         except Exception as e:
             logger.warning(f"Failed to load config file: {e}")
     
@@ -467,7 +840,87 @@ def load_config() -> Dict[str, Any]:
     return config
 
 
+def _cmd_list_projects(nas: SynologyShutdown, args):
+    """Handler for --list-projects"""
+    projects_data = nas.get_projects()
+    if not projects_data:
+        logger.error("Failed to get project list")
+        sys.exit(1)
+
+    projects = projects_data.get('projects', [])
+    logger.info(f"Found {len(projects)} Docker Compose projects:")
+    for project in projects:
+        name = project.get('name', 'Unknown')
+        status = project.get('status', 'Unknown')
+        logger.info(f"  - {name}: {status}")
+
+
+def _manage_all_projects(nas: SynologyShutdown, action: str):
+    """Shared handler for --start-projects / --stop-projects"""
+    verb = 'Starting' if action == 'start' else 'Stopping'
+    past = 'started' if action == 'start' else 'stopped'
+    logger.info(f"{verb} predefined projects...")
+    results = nas.manage_predefined_projects(action)
+    success_count = sum(1 for success in results.values() if success)
+    logger.info(f"Successfully {past} {success_count}/{len(results)} projects")
+    for project, success in results.items():
+        status = "✅" if success else "❌"
+        logger.info(f"  {status} {project}")
+
+    if not all(results.values()):
+        sys.exit(1)
+
+
+def _cmd_start_projects(nas: SynologyShutdown, args):
+    _manage_all_projects(nas, 'start')
+
+
+def _cmd_stop_projects(nas: SynologyShutdown, args):
+    _manage_all_projects(nas, 'stop')
+
+
+def _cmd_start_project(nas: SynologyShutdown, args):
+    """Handler for --start-project"""
+    if nas.start_project(project_name=args.start_project):
+        logger.info(f"Project {args.start_project} started successfully")
+    else:
+        logger.error(f"Failed to start project {args.start_project}")
+        sys.exit(1)
+
+
+def _cmd_stop_project(nas: SynologyShutdown, args):
+    """Handler for --stop-project"""
+    if nas.stop_project(project_name=args.stop_project):
+        logger.info(f"Project {args.stop_project} stopped successfully")
+    else:
+        logger.error(f"Failed to stop project {args.stop_project}")
+        sys.exit(1)
+
+
+def _cmd_project_status(nas: SynologyShutdown, args):
+    """Handler for --project-status"""
+    status = nas.get_project_status(args.project_status)
+    if status:
+        logger.info(f"Project {args.project_status} status: {status}")
+    else:
+        logger.error(f"Could not get status for project {args.project_status}")
+        sys.exit(1)
+
+
+# argparse dest -> handler; the first truthy dest wins
+PROJECT_ACTIONS = {
+    'list_projects': _cmd_list_projects,
+    'start_projects': _cmd_start_projects,
+    'stop_projects': _cmd_stop_projects,
+    'start_project': _cmd_start_project,
+    'stop_project': _cmd_stop_project,
+    'project_status': _cmd_project_status,
+}
+
+
 def main():
+    import argparse
+
     parser = argparse.ArgumentParser(description='Shutdown Synology NAS and manage Docker Compose projects')
     parser.add_argument('--host', help='Synology NAS IP address or hostname')
     parser.add_argument('--username', help='Admin username')
@@ -509,74 +962,17 @@ def main():
     nas = SynologyShutdown(host, username, password, port, use_https)
     
     # Handle project management commands
-    if any([args.start_projects, args.stop_projects, args.list_projects, args.start_project, args.stop_project, args.project_status]):
+    action = next((name for name in PROJECT_ACTIONS if getattr(args, name)), None)
+    if action:
         if not nas.login():
             logger.error("Failed to login to NAS")
             sys.exit(1)
-        
+
         try:
-            if args.list_projects:
-                projects_data = nas.get_projects()
-                if projects_data:
-                    projects = projects_data.get('projects', [])
-                    logger.info(f"Found {len(projects)} Docker Compose projects:")
-                    for project in projects:
-                        name = project.get('name', 'Unknown')
-                        status = project.get('status', 'Unknown')
-                        logger.info(f"  - {name}: {status}")
-                else:
-                    logger.error("Failed to get project list")
-                    sys.exit(1)
-            
-            elif args.start_projects:
-                logger.info("Starting predefined projects...")
-                results = nas.manage_predefined_projects('start')
-                success_count = sum(1 for success in results.values() if success)
-                logger.info(f"Successfully started {success_count}/{len(results)} projects")
-                for project, success in results.items():
-                    status = "✅" if success else "❌"
-                    logger.info(f"  {status} {project}")
-                
-                if not all(results.values()):
-                    sys.exit(1)
-            
-            elif args.stop_projects:
-                logger.info("Stopping predefined projects...")
-                results = nas.manage_predefined_projects('stop')
-                success_count = sum(1 for success in results.values() if success)
-                logger.info(f"Successfully stopped {success_count}/{len(results)} projects")
-                for project, success in results.items():
-                    status = "✅" if success else "❌"
-                    logger.info(f"  {status} {project}")
-                
-                if not all(results.values()):
-                    sys.exit(1)
-            
-            elif args.start_project:
-                if nas.start_project(project_name=args.start_project):
-                    logger.info(f"Project {args.start_project} started successfully")
-                else:
-                    logger.error(f"Failed to start project {args.start_project}")
-                    sys.exit(1)
-            
-            elif args.stop_project:
-                if nas.stop_project(project_name=args.stop_project):
-                    logger.info(f"Project {args.stop_project} stopped successfully")
-                else:
-                    logger.error(f"Failed to stop project {args.stop_project}")
-                    sys.exit(1)
-            
-            elif args.project_status:
-                status = nas.get_project_status(args.project_status)
-                if status:
-                    logger.info(f"Project {args.project_status} status: {status}")
-                else:
-                    logger.error(f"Could not get status for project {args.project_status}")
-                    sys.exit(1)
-        
+            PROJECT_ACTIONS[action](nas, args)
         finally:
             nas.logout()
-        
+
         sys.exit(0)
     
     # Default behavior: shutdown NAS
@@ -4,187 +4,415 @@ Synology NAS Shutdown Web Interface
 A Flask web application with a simple shutdown button
 """
 
+# gevent must patch the stdlib before requests/urllib3 are imported so
+# socket I/O is cooperative under the gunicorn gevent workers; without
+# gevent installed (plain dev runs) everything stays threaded
+try:
+    from gevent import monkey
+    monkey.patch_all()
+except ImportError:
+    pass
+
 import os
 import json
+import queue
+import hashlib
+import functools
+import atexit
 import logging
 import threading
 import time
-from datetime import datetime
-from flask import Flask, render_template, request, jsonify, redirect, url_for
-from synology_shutdown import SynologyShutdown, load_config
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field, replace
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from flask import Flask, render_template, request, redirect, url_for, Response
+from synology_shutdown import SynologyShutdown, load_config, PREDEFINED_PROJECTS, build_session
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# orjson is a C-extension serializer, several-fold faster than stdlib
+# json on the hot status/event paths; fall back when it's not installed
+try:
+    import orjson
+
+    def _dumps(payload):
+        return orjson.dumps(payload, default=str)
+except ImportError:
+    def _dumps(payload):
+        return json.dumps(payload, default=str).encode()
+
 app = Flask(__name__)
 app.secret_key = os.environ.get('FLASK_SECRET_KEY', 'synology-shutdown-secret-key')
 
-# Global variables for tracking shutdown state
-shutdown_status = {
-    'in_progress': False,
-    'success': None,
-    'message': '',
-    'timestamp': None
-}
+# Shared worker pool for background NAS jobs - enqueueing reuses existing
+# threads instead of paying thread creation on every request
+executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='nas')
+atexit.register(executor.shutdown, wait=False)
+
+# One HTTP session shared by every NAS client this process constructs, so
+# warm requests reuse pooled keep-alive sockets instead of paying a fresh
+# TCP/TLS handshake per client
+_nas_session = build_session()
+
+# Workers stamp snapshots with monotonic nanoseconds (cheaper than a
+# datetime construction and immune to wall-clock jumps); the wall-clock
+# ISO form is derived only when a snapshot is serialized
+_START_WALL = datetime.now(timezone.utc)
+_START_MONO = time.monotonic_ns()
+
+
+# Status snapshots are immutable and swapped atomically under _status_lock,
+# so readers never observe a half-updated state (e.g. success set while
+# in_progress is still True)
+@dataclass(frozen=True, slots=True)
+class Status:
+    """Snapshot of the shutdown workflow state"""
+    in_progress: bool = False
+    success: Optional[bool] = None
+    message: str = ''
+    timestamp_ns: Optional[int] = None
+
+
+@dataclass(frozen=True, slots=True)
+class ProjectStatus:
+    """Snapshot of the project management workflow state"""
+    in_progress: bool = False
+    success: Optional[bool] = None
+    message: str = ''
+    timestamp_ns: Optional[int] = None
+    results: dict = field(default_factory=dict)
+
+
+def _snapshot_dict(status):
+    """asdict() with the monotonic timestamp rendered as wall-clock ISO"""
+    data = asdict(status)
+    ts_ns = data.pop('timestamp_ns')
+    data['timestamp'] = None
+    if ts_ns is not None:
+        wall = _START_WALL + timedelta(microseconds=(ts_ns - _START_MONO) // 1000)
+        data['timestamp'] = wall.isoformat()
+    return data
+
+
+_status_lock = threading.Lock()
+shutdown_status = Status()
+project_status = ProjectStatus()
+
+
+def _publish_shutdown(**changes):
+    """Swap in an updated shutdown snapshot and notify subscribers
+
+    The single write path for shutdown state: one atomic swap under the
+    lock, one broadcast, per state transition.
+    """
+    global shutdown_status
+    with _status_lock:
+        shutdown_status = snapshot = replace(shutdown_status, **changes)
+    broadcast('shutdown', snapshot)
+    return snapshot
+
+
+def _publish_projects(**changes):
+    """Swap in an updated project snapshot and notify subscribers
+
+    Single write path for project management state, mirroring
+    _publish_shutdown.
+    """
+    global project_status
+    with _status_lock:
+        project_status = snapshot = replace(project_status, **changes)
+    broadcast('projects', snapshot)
+    return snapshot
+
+# Queues of connected /events subscribers; each SSE client gets its own
+_subscribers = set()
+_subscribers_lock = threading.Lock()
+
+
+def broadcast(kind, status):
+    """Push a status snapshot to every connected /events subscriber"""
+    payload = _dumps({'kind': kind, **_snapshot_dict(status)}).decode()
+    with _subscribers_lock:
+        for subscriber in _subscribers:
+            subscriber.put_nowait(payload)
+
+
+# Parsed config cache keyed on the config file's mtime, so steady-state
+# request handling skips the disk read and JSON parse entirely
+_config_cache = {'mtime': None, 'value': None}
+_config_lock = threading.Lock()
+
+
+def cached_load_config():
+    """load_config() with mtime-based invalidation of the parsed result"""
+    config_file = os.environ.get('CONFIG_FILE', '/app/config.json')
+    try:
+        mtime = os.stat(config_file).st_mtime_ns
+    except OSError:
+        # No config file - environment-only setup, cache the first load
+        mtime = -1
+
+    with _config_lock:
+        if _config_cache['mtime'] != mtime:
+            _config_cache['value'] = load_config()
+            _config_cache['mtime'] = mtime
+        return _config_cache['value']
+
+
+class NasClientPool:
+    """Process-wide authenticated NAS client with TTL-based re-login
+
+    Keeps one logged-in SynologyShutdown per process so steady-state
+    handlers reuse its SID and pooled TCP connections instead of paying
+    a full login/logout round trip on every request.
+    """
+
+    _TTL = 600.0
 
-# Global variables for tracking project management state
-project_status = {
-    'in_progress': False,
-    'success': None,
-    'message': '',
-    'timestamp': None,
-    'results': {}
-}
+    def __init__(self):
+        self._client = None
+        self._expiry = 0.0
+        self._lock = threading.Lock()
+
+    def get(self, config):
+        """Return a logged-in client, re-authenticating on expiry"""
+        with self._lock:
+            if self._client is None or time.monotonic() > self._expiry:
+                self._replace_locked(config)
+            return self._client
+
+    def invalidate(self):
+        """Drop the cached client (e.g. after the NAS rejected its SID)
+
+        Only the reference is dropped - no logout. Another thread may
+        have fetched the same client from get() and still be mid-batch
+        with it; actively killing the SID would fail all its remaining
+        calls. DSM reaps the orphaned session when its own TTL expires.
+        """
+        with self._lock:
+            self._drop_locked()
+
+    def _drop_locked(self):
+        self._client = None
+        self._expiry = 0.0
+
+    def _replace_locked(self, config):
+        self._drop_locked()
+        client = SynologyShutdown(
+            host=config['host'],
+            username=config['username'],
+            password=config['password'],
+            port=config['port'],
+            use_https=config['use_https'],
+            session=_nas_session
+        )
+        if not client.login():
+            raise RuntimeError('Failed to login to NAS')
+        self._client = client
+        self._expiry = time.monotonic() + self._TTL
+
+
+nas_pool = NasClientPool()
+
+# Pre-encoded JSON bodies for fixed-shape responses; only the variable
+# part is substituted, skipping dict construction and jsonify per request
+_HEALTH_TMPL = b'{"status":"healthy","timestamp":"%s"}'
+_MISSING_CONFIG_TMPL = b'{"success":false,"message":"Missing configuration: %s"}'
+
+
+def ojson(payload, status=200):
+    """jsonify replacement built on the faster serializer"""
+    return Response(_dumps(payload), status=status, mimetype='application/json')
+
+
+def _missing_config_response(missing_fields):
+    """400 response for the config-validation failure path"""
+    body = _MISSING_CONFIG_TMPL % ', '.join(missing_fields).encode()
+    return Response(body, status=400, mimetype='application/json')
+
+
+_REQUIRED_FIELDS = ('host', 'username', 'password')
+
+
+def require_config(fn):
+    """Load and validate the config once, passing it to the handler
+
+    Rejects the request with the precomputed missing-configuration 400
+    when a required field is absent, so decorated handlers only ever see
+    a usable config and skip their own load/validate boilerplate.
+    """
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        config = cached_load_config()
+        missing_fields = [name for name in _REQUIRED_FIELDS if not config.get(name)]
+        if missing_fields:
+            return _missing_config_response(missing_fields)
+        return fn(config, *args, **kwargs)
+    return wrapper
+
+
+# Shared snapshot of predefined project statuses. One background poller
+# refreshes it, so all concurrent viewers share a single NAS round trip
+# instead of each /current-projects request hitting the NAS itself
+_current_projects = {}
+_current_projects_lock = threading.Lock()
+_POLL_INTERVAL = 5.0
+
+# frozenset for O(1) membership checks in the poller's filtering loop
+_PREDEFINED_PROJECTS = frozenset(PREDEFINED_PROJECTS)
+
+
+def _project_poller():
+    """Refresh _current_projects from the NAS every poll interval"""
+    global _current_projects
+    while True:
+        config = cached_load_config()
+        if all(config.get(name) for name in _REQUIRED_FIELDS):
+            try:
+                nas = nas_pool.get(config)
+                projects_data = nas.get_projects(force_refresh=True)
+                if projects_data is None:
+                    # SID likely went stale; a fresh login happens next cycle
+                    nas_pool.invalidate()
+                else:
+                    statuses = {
+                        project['name']: project.get('status', 'unknown')
+                        for project in projects_data.get('projects', ())
+                        if project.get('name') in _PREDEFINED_PROJECTS
+                    }
+                    with _current_projects_lock:
+                        _current_projects = statuses
+            except Exception as e:
+                logger.debug(f"Project poll failed: {e}")
+                nas_pool.invalidate()
+        time.sleep(_POLL_INTERVAL)
+
+
+threading.Thread(target=_project_poller, name='project-poller', daemon=True).start()
 
 
 def shutdown_nas_async(config):
     """Perform NAS shutdown in background thread"""
-    global shutdown_status
-    
     try:
-        shutdown_status['in_progress'] = True
-        shutdown_status['message'] = 'Connecting to NAS...'
-        shutdown_status['timestamp'] = datetime.now()
-        
+        _publish_shutdown(in_progress=True, success=None,
+                          message='Connecting to NAS...',
+                          timestamp_ns=time.monotonic_ns())
+
         nas = SynologyShutdown(
             host=config['host'],
             username=config['username'],
             password=config['password'],
             port=config['port'],
-            use_https=config['use_https']
+            use_https=config['use_https'],
+            session=_nas_session
         )
-        
-        shutdown_status['message'] = 'Initiating shutdown...'
+
+        _publish_shutdown(message='Initiating shutdown...')
         success = nas.shutdown(
             use_ssh=config.get('use_ssh', False),
             ssh_port=config.get('ssh_port', 22)
         )
-        
-        shutdown_status['success'] = success
-        shutdown_status['in_progress'] = False
-        
+
         if success:
-            shutdown_status['message'] = 'NAS shutdown initiated successfully'
+            message = 'NAS shutdown initiated successfully'
         else:
-            shutdown_status['message'] = 'Failed to shutdown NAS'
-            
+            message = 'Failed to shutdown NAS'
+        _publish_shutdown(in_progress=False, success=success, message=message)
+
     except Exception as e:
         logger.error(f"Shutdown error: {e}")
-        shutdown_status['success'] = False
-        shutdown_status['in_progress'] = False
-        shutdown_status['message'] = f'Error: {str(e)}'
+        _publish_shutdown(in_progress=False, success=False,
+                          message=f'Error: {str(e)}')
 
 
 def manage_projects_async(config, action):
     """Perform project management in background thread"""
-    global project_status
-    
     try:
-        project_status['in_progress'] = True
-        project_status['message'] = f'{action.capitalize()}ing projects...'
-        project_status['timestamp'] = datetime.now()
-        
-        nas = SynologyShutdown(
-            host=config['host'],
-            username=config['username'],
-            password=config['password'],
-            port=config['port'],
-            use_https=config['use_https']
-        )
-        
-        if nas.login():
-            project_status['message'] = f'{action.capitalize()}ing Docker Compose projects...'
-            results = nas.manage_predefined_projects(action)
-            
-            project_status['success'] = all(results.values())
-            project_status['in_progress'] = False
-            project_status['results'] = results
-            
-            if project_status['success']:
-                project_status['message'] = f'All projects {action}ed successfully'
-            else:
-                failed_projects = [name for name, success in results.items() if not success]
-                project_status['message'] = f'Failed to {action}: {", ".join(failed_projects)}'
-            
-            nas.logout()
+        _publish_projects(in_progress=True, success=None,
+                          message=f'{action.capitalize()}ing projects...',
+                          timestamp_ns=time.monotonic_ns(), results={})
+
+        nas = nas_pool.get(config)
+        _publish_projects(message=f'{action.capitalize()}ing Docker Compose projects...')
+        results = nas.manage_predefined_projects(action)
+
+        success = all(results.values())
+        if success:
+            message = f'All projects {action}ed successfully'
         else:
-            project_status['success'] = False
-            project_status['in_progress'] = False
-            project_status['message'] = 'Failed to login to NAS'
-            
+            failed_projects = [name for name, ok in results.items() if not ok]
+            message = f'Failed to {action}: {", ".join(failed_projects)}'
+
+        _publish_projects(in_progress=False, success=success,
+                          message=message, results=results)
+
     except Exception as e:
         logger.error(f"Project management error: {e}")
-        project_status['success'] = False
-        project_status['in_progress'] = False
-        project_status['message'] = f'Error: {str(e)}'
+        _publish_projects(in_progress=False, success=False,
+                          message=f'Error: {str(e)}')
+
+
+@functools.lru_cache(maxsize=8)
+def _render_index(nas_host):
+    """Render the index page once per NAS host
+
+    The page is static apart from nas_host - statuses stream in over
+    /events and /current-projects - so the rendered bytes and their ETag
+    are cached instead of re-running Jinja on every GET.
+    """
+    body = render_template('index.html',
+                           nas_host=nas_host,
+                           status=Status(),
+                           project_status=ProjectStatus(),
+                           current_projects={}).encode()
+    etag = f'"{hashlib.md5(body).hexdigest()}"'
+    return body, etag
 
 
 @app.route('/')
 def index():
-    """Main page with shutdown button"""
-    config = load_config()
+    """Main page with shutdown button
+
+    Renders immediately; the browser pulls live project statuses from
+    /current-projects after first paint instead of the page blocking on a
+    NAS round trip. Repeat loads with a matching ETag get a bodyless 304.
+    """
+    config = cached_load_config()
     nas_host = config.get('host', 'Not configured')
-    
-    # Get current project statuses
-    current_projects = {}
-    try:
-        nas = SynologyShutdown(
-            host=config['host'],
-            username=config['username'],
-            password=config['password'],
-            port=config['port'],
-            use_https=config['use_https']
-        )
-        
-        if nas.login():
-            projects_data = nas.get_projects()
-            if projects_data:
-                projects = projects_data.get('projects', [])
-                predefined_projects = ['iot', 'jellyfin', 'arr-project', 'watchtower']
-                for project in projects:
-                    name = project.get('name', '')
-                    if name in predefined_projects:
-                        current_projects[name] = project.get('status', 'unknown')
-            nas.logout()
-    except Exception as e:
-        logger.warning(f"Could not fetch project statuses: {e}")
-    
-    return render_template('index.html', 
-                         nas_host=nas_host, 
-                         status=shutdown_status, 
-                         project_status=project_status,
-                         current_projects=current_projects)
+
+    body, etag = _render_index(nas_host)
+    if request.headers.get('If-None-Match') == etag:
+        return Response(status=304, headers={'ETag': etag})
+    return Response(body, mimetype='text/html', headers={'ETag': etag})
+
+
+@app.route('/current-projects')
+def current_projects():
+    """Current status of the predefined Docker Compose projects
+
+    Served from the background poller's shared snapshot, so the request
+    never blocks on the NAS.
+    """
+    with _current_projects_lock:
+        return ojson(dict(_current_projects))
 
 
 @app.route('/shutdown', methods=['POST'])
-def shutdown():
+@require_config
+def shutdown(config):
     """Handle shutdown request"""
-    global shutdown_status
-    
-    if shutdown_status['in_progress']:
-        return jsonify({
+    if shutdown_status.in_progress:
+        return ojson({
             'success': False,
             'message': 'Shutdown already in progress'
-        }), 400
-    
-    config = load_config()
-    
-    # Validate configuration
-    required_fields = ['host', 'username', 'password']
-    missing_fields = [field for field in required_fields if not config.get(field)]
-    
-    if missing_fields:
-        return jsonify({
-            'success': False,
-            'message': f'Missing configuration: {", ".join(missing_fields)}'
-        }), 400
-    
-    # Start shutdown in background thread
-    shutdown_thread = threading.Thread(target=shutdown_nas_async, args=(config,))
-    shutdown_thread.daemon = True
-    shutdown_thread.start()
-    
-    return jsonify({
+        }, 400)
+
+    # Run the shutdown on the shared worker pool
+    executor.submit(shutdown_nas_async, config)
+
+    return ojson({
         'success': True,
         'message': 'Shutdown initiated'
     })
@@ -193,44 +421,66 @@ def shutdown():
 @app.route('/status')
 def status():
     """Get current shutdown status"""
-    return jsonify(shutdown_status)
+    with _status_lock:
+        snapshot = shutdown_status
+    return ojson(_snapshot_dict(snapshot))
+
+
+@app.route('/events')
+def events():
+    """Server-Sent Events stream of shutdown/project status changes
+
+    Replaces client-side polling of /status and /project-status: the
+    background workers broadcast each state transition and connected
+    browsers receive it immediately over one long-lived response.
+    """
+    def generate():
+        subscriber = queue.Queue()
+        with _subscribers_lock:
+            _subscribers.add(subscriber)
+        try:
+            # Initial snapshots so a late joiner renders the current state
+            with _status_lock:
+                snapshots = (shutdown_status, project_status)
+            yield f"data: {_dumps({'kind': 'shutdown', **_snapshot_dict(snapshots[0])}).decode()}\n\n"
+            yield f"data: {_dumps({'kind': 'projects', **_snapshot_dict(snapshots[1])}).decode()}\n\n"
+            while True:
+                try:
+                    payload = subscriber.get(timeout=15)
+                except queue.Empty:
+                    # Comment frame keeps proxies from closing the stream
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"data: {payload}\n\n"
+        finally:
+            with _subscribers_lock:
+                _subscribers.discard(subscriber)
+
+    return Response(generate(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache',
+                             'X-Accel-Buffering': 'no'})
 
 
 @app.route('/projects/<action>', methods=['POST'])
-def manage_projects(action):
+@require_config
+def manage_projects(config, action):
     """Handle project start/stop requests"""
-    global project_status
-    
     if action not in ['start', 'stop']:
-        return jsonify({
+        return ojson({
             'success': False,
             'message': 'Invalid action. Use start or stop.'
-        }), 400
-    
-    if project_status['in_progress']:
-        return jsonify({
+        }, 400)
+
+    if project_status.in_progress:
+        return ojson({
             'success': False,
             'message': 'Project management already in progress'
-        }), 400
-    
-    config = load_config()
-    
-    # Validate configuration
-    required_fields = ['host', 'username', 'password']
-    missing_fields = [field for field in required_fields if not config.get(field)]
-    
-    if missing_fields:
-        return jsonify({
-            'success': False,
-            'message': f'Missing configuration: {", ".join(missing_fields)}'
-        }), 400
-    
-    # Start project management in background thread
-    project_thread = threading.Thread(target=manage_projects_async, args=(config, action))
-    project_thread.daemon = True
-    project_thread.start()
-    
-    return jsonify({
+        }, 400)
+
+    # Run the project management on the shared worker pool
+    executor.submit(manage_projects_async, config, action)
+
+    return ojson({
         'success': True,
         'message': f'Project {action} initiated'
     })
@@ -239,13 +489,15 @@ def manage_projects(action):
 @app.route('/project-status')
 def get_project_status():
     """Get current project management status"""
-    return jsonify(project_status)
+    with _status_lock:
+        snapshot = project_status
+    return ojson(_snapshot_dict(snapshot))
 
 
 @app.route('/config')
 def config_page():
     """Configuration page"""
-    config = load_config()
+    config = cached_load_config()
     # Don't expose password in the config page
     safe_config = {k: v for k, v in config.items() if k != 'password'}
     if 'password' in config:
@@ -258,19 +510,38 @@ def config_page():
 
 @app.route('/health')
 def health():
-    """Health check endpoint"""
-    return jsonify({
-        'status': 'healthy',
-        'timestamp': datetime.now().isoformat()
-    })
+    """Health check endpoint (fallback for non-GET probes)"""
+    body = _HEALTH_TMPL % datetime.now(timezone.utc).isoformat().encode()
+    return Response(body, mimetype='application/json')
+
+
+_HEALTH_BODY = b'{"status":"healthy"}'
+
+
+def _health_middleware(wsgi_app):
+    """Answer GET /health at the WSGI layer, before Flask routing
+
+    The container liveness probe hits /health every 30s; serving the
+    constant body here skips URL matching, request-context setup and
+    response-object construction entirely.
+    """
+    def wsgi(environ, start_response):
+        if environ.get('PATH_INFO') == '/health' and environ.get('REQUEST_METHOD') == 'GET':
+            start_response('200 OK', [('Content-Type', 'application/json'),
+                                      ('Content-Length', str(len(_HEALTH_BODY)))])
+            return [_HEALTH_BODY]
+        return wsgi_app(environ, start_response)
+    return wsgi
+
+
+app.wsgi_app = _health_middleware(app.wsgi_app)
 
 
 if __name__ == '__main__':
-    config = load_config()
+    config = cached_load_config()
     
     # Validate configuration on startup
-    required_fields = ['host', 'username', 'password']
-    missing_fields = [field for field in required_fields if not config.get(field)]
+    missing_fields = [name for name in _REQUIRED_FIELDS if not config.get(name)]
     
     if missing_fields:
         logger.warning(f"Missing configuration fields: {', '.join(missing_fields)}")
@@ -284,4 +555,6 @@ if __name__ == '__main__':
     debug = os.environ.get('FLASK_DEBUG', 'false').lower() == 'true'
     
     logger.info(f"Starting web interface on {host}:{port}")
-    app.run(host=host, port=port, debug=debug)
\ No newline at end of file
+    # threaded=True so long-lived /events streams and slow NAS-bound
+    # requests don't serialize the whole dev server
+    app.run(host=host, port=port, debug=debug, threaded=True)
\ No newline at end of file